@@ -0,0 +1,256 @@
+import logging
+import time
+
+import numpy as np
+
+# DHT22 pulse widths in microseconds (datasheet nominal values)
+START_LOW_US = 1100        # host start signal, must be >= 1 ms
+ZERO_HIGH_US = 27          # high pulse for a '0' bit (26-28 us)
+ONE_HIGH_US = 70           # high pulse for a '1' bit
+BIT_LOW_US = 50            # low pulse preceding every bit
+RESPONSE_US = 80           # sensor's response low, then high, before the data
+FRAME_BITS = 40
+
+# Kernel-side edge event queue; a frame is ~85 edges in ~4 ms, well over the
+# default of 16 per line, so size it to hold a whole frame
+EVENT_BUFFER_SIZE = 128
+
+# No edge for this long once the frame has started means the sensor is done;
+# the longest gap inside a frame is the 80 us response pulse
+IDLE_GAP_S = 200e-6
+
+# The DHT22 can't be polled faster than once every 2 seconds
+MIN_INTERVAL_S = 2.0
+
+
+def decode_edges(timestamps_ns, levels, tolerance_us=20):
+    """Decode a DHT22 frame from edge timestamps.
+
+    ``timestamps_ns`` are edge times in nanoseconds and ``levels`` the line
+    level *after* each edge (1 = rising, 0 = falling). Every pulse is
+    measured at once; the 40 high pulses following the sensor's 80/80 us
+    response form the data frame. Returns
+    ``(temperature_c, humidity)`` or raises RuntimeError, like adafruit_dht.
+    """
+    ts = np.asarray(timestamps_ns, dtype=np.int64)
+    lv = np.asarray(levels, dtype=np.int8)
+    if ts.shape != lv.shape or ts.ndim != 1:
+        raise ValueError("timestamps and levels must be 1-D and equal length")
+
+    # A high pulse is a rising edge immediately followed by a falling edge;
+    # the response high is also preceded by an ~80 us low, which no data bit
+    # has, so the frame is anchored there rather than counted from the end
+    dt = np.diff(ts) / 1000.0
+    highs = np.flatnonzero((lv[:-1] == 1) & (lv[1:] == 0))
+    widths = dt[highs]
+    low_before = np.full(widths.shape, np.nan)
+    has_low = (highs > 0) & (lv[highs - 1] == 0)
+    low_before[has_low] = dt[highs[has_low] - 1]
+    response = np.flatnonzero(
+        (np.abs(widths - RESPONSE_US) <= tolerance_us)
+        & (np.abs(low_before - RESPONSE_US) <= tolerance_us))
+    if response.size == 0:
+        raise RuntimeError("DHT22 response pulse not found")
+    widths = widths[response[0] + 1:response[0] + 1 + FRAME_BITS]
+    if widths.size < FRAME_BITS:
+        raise RuntimeError(
+            "DHT22 frame too short: %d of %d bits" % (widths.size, FRAME_BITS))
+
+    bits = widths > (ZERO_HIGH_US + ONE_HIGH_US) / 2
+    error = np.abs(widths - np.where(bits, ONE_HIGH_US, ZERO_HIGH_US))
+    if np.any(error > tolerance_us):
+        bad = int(np.argmax(error))
+        raise RuntimeError(
+            "DHT22 bit %d out of tolerance: %.1f us" % (bad, widths[bad]))
+
+    data = np.packbits(bits.astype(np.uint8))
+    if (int(data[:4].sum()) & 0xFF) != int(data[4]):
+        raise RuntimeError("DHT22 checksum did not validate")
+
+    humidity = ((int(data[0]) << 8) | int(data[1])) / 10.0
+    temperature = (((int(data[2]) & 0x7F) << 8) | int(data[3])) / 10.0
+    if data[2] & 0x80:
+        temperature = -temperature
+    return temperature, humidity
+
+
+def synthesize_edges(temperature, humidity, jitter_us=0.0, rng=None):
+    """Build a DHT22 edge trace for offline testing of decode_edges.
+
+    Returns ``(timestamps_ns, levels)`` including the sensor's 80/80 us
+    response and trailing release. ``jitter_us`` adds gaussian noise with
+    that standard deviation to every pulse width (clipped to stay positive,
+    so edges never swap order).
+    """
+    hum = int(round(humidity * 10))
+    temp = int(round(abs(temperature) * 10))
+    if temperature < 0:
+        temp |= 0x8000
+    data = [hum >> 8, hum & 0xFF, temp >> 8, temp & 0xFF]
+    data.append(sum(data) & 0xFF)
+    bits = np.unpackbits(np.array(data, dtype=np.uint8))
+
+    # (duration_us, level) for each segment, starting with the host's low
+    segments = [(START_LOW_US, 0), (30, 1), (80, 0), (80, 1)]
+    for bit in bits:
+        segments.append((BIT_LOW_US, 0))
+        segments.append((ONE_HIGH_US if bit else ZERO_HIGH_US, 1))
+    segments.append((BIT_LOW_US, 0))
+    segments.append((0, 1))
+
+    durations = np.array([d for d, _ in segments], dtype=np.float64)
+    levels = np.array([lv for _, lv in segments], dtype=np.int8)
+    if jitter_us:
+        rng = rng if rng is not None else np.random.default_rng()
+        noise = rng.normal(0.0, jitter_us, durations.size)
+        durations = np.maximum(durations + noise, 1.0)
+    times_us = np.concatenate(([0.0], np.cumsum(durations[:-1])))
+    return (times_us * 1000).astype(np.int64), levels
+
+
+def save_trace(path, timestamps_ns, levels):
+    """Save a captured edge trace to an ``.npz`` file for later replay."""
+    np.savez(path,
+             timestamps_ns=np.asarray(timestamps_ns, dtype=np.int64),
+             levels=np.asarray(levels, dtype=np.int8))
+
+
+def load_trace(path):
+    """Load a trace written by save_trace as ``(timestamps_ns, levels)``."""
+    with np.load(path) as trace:
+        return trace["timestamps_ns"], trace["levels"]
+
+
+class DHT22EdgeReader:
+    """DHT22 driver that decodes kernel-timestamped GPIO edge events.
+
+    Drop-in for ``adafruit_dht.DHT22``: exposes ``temperature``,
+    ``humidity`` and ``exit()``. Requires the libgpiod v2 Python bindings.
+    The raw ``(timestamps_ns, levels)`` of the latest capture is kept in
+    ``last_trace`` so it can be saved with save_trace and replayed.
+    """
+
+    def __init__(self, line_offset, chip="/dev/gpiochip0",
+                 tolerance_us=20, timeout_s=0.05):
+        import gpiod
+        from gpiod.line import Bias, Direction, Edge, Value
+
+        self._gpiod = gpiod
+        self._Bias, self._Direction = Bias, Direction
+        self._Edge, self._Value = Edge, Value
+        self.line_offset = line_offset
+        self.tolerance_us = tolerance_us
+        self.timeout_s = timeout_s
+        self._last_read = 0.0
+        self._temperature = None
+        self._humidity = None
+        self.last_trace = None
+        self._request = gpiod.request_lines(
+            chip,
+            consumer="heatsync-dht22",
+            config={line_offset: self._input_settings()},
+            event_buffer_size=EVENT_BUFFER_SIZE,
+        )
+
+    def _input_settings(self):
+        return self._gpiod.LineSettings(
+            direction=self._Direction.INPUT,
+            edge_detection=self._Edge.BOTH,
+            bias=self._Bias.PULL_UP,
+        )
+
+    def _capture(self):
+        """Send the start signal and collect edge events until the line idles.
+
+        Collection ends once no edge has arrived for IDLE_GAP_S after the
+        first one, or at ``timeout_s`` if the sensor never answers.
+        """
+        # Discard leftovers from an earlier capture that timed out mid-frame
+        while self._request.wait_edge_events(0):
+            self._request.read_edge_events()
+
+        self._request.reconfigure_lines({
+            self.line_offset: self._gpiod.LineSettings(
+                direction=self._Direction.OUTPUT,
+                output_value=self._Value.INACTIVE,
+            )
+        })
+        time.sleep(START_LOW_US / 1e6)
+        self._request.reconfigure_lines({self.line_offset: self._input_settings()})
+
+        timestamps, levels, seqnos = [], [], []
+        deadline = time.monotonic() + self.timeout_s
+        while True:
+            remaining = deadline - time.monotonic()
+            if timestamps:
+                remaining = min(remaining, IDLE_GAP_S)
+            if remaining <= 0 or not self._request.wait_edge_events(remaining):
+                break
+            for event in self._request.read_edge_events():
+                timestamps.append(event.timestamp_ns)
+                levels.append(
+                    1 if event.event_type == event.Type.RISING_EDGE else 0)
+                seqnos.append(event.line_seqno)
+
+        self.last_trace = (np.asarray(timestamps, dtype=np.int64),
+                           np.asarray(levels, dtype=np.int8))
+        if np.any(np.diff(seqnos) != 1):
+            raise RuntimeError("DHT22 edge events dropped by the kernel")
+        return self.last_trace
+
+    def measure(self):
+        """Read the sensor, reusing the last result inside the 2 s window."""
+        if time.monotonic() - self._last_read < MIN_INTERVAL_S:
+            return
+        self._last_read = time.monotonic()
+        timestamps, levels = self._capture()
+        self._temperature, self._humidity = decode_edges(
+            timestamps, levels, self.tolerance_us)
+
+    @property
+    def temperature(self):
+        self.measure()
+        return self._temperature
+
+    @property
+    def humidity(self):
+        self.measure()
+        return self._humidity
+
+    def exit(self):
+        self._request.release()
+        logging.info("DHT22 edge reader released line %d", self.line_offset)
+
+
+def benchmark(runs=1000, jitters_us=(0, 2, 5, 10, 15), tolerance_us=20):
+    """Report decode time and success rate under injected pulse-width jitter.
+
+    Each decode is compared with the values the trace was built from;
+    frames that decode to the wrong reading are counted as mismatches.
+    """
+    rng = np.random.default_rng(0)
+    for jitter in jitters_us:
+        expected = [(round(rng.uniform(-40, 80), 1), round(rng.uniform(0, 100), 1))
+                    for _ in range(runs)]
+        traces = [synthesize_edges(t, h, jitter, rng) for t, h in expected]
+        ok = mismatched = 0
+        start = time.perf_counter()
+        for (ts, lv), (t, h) in zip(traces, expected):
+            try:
+                temperature, humidity = decode_edges(ts, lv, tolerance_us)
+            except RuntimeError:
+                continue
+            if (round(temperature * 10) == round(t * 10)
+                    and round(humidity * 10) == round(h * 10)):
+                ok += 1
+            else:
+                mismatched += 1
+        elapsed = time.perf_counter() - start
+        print("jitter %5.1f us, tolerance %d us: %6.1f us/decode, "
+              "%5.1f%% ok, %5.1f%% mismatched"
+              % (jitter, tolerance_us, elapsed / runs * 1e6,
+                 100.0 * ok / runs, 100.0 * mismatched / runs))
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -11,11 +11,24 @@ class SensorManager:
                  bus_num=1,
                  device_addr=0x10,
                  fan_channel=1,
-                 heater_channel=4):
-        # DHT22
+                 heater_channel=4,
+                 dht_backend="adafruit",
+                 gpio_chip="/dev/gpiochip0",
+                 dht_tolerance_us=20):
+        if dht_backend not in ("adafruit", "edge"):
+            raise ValueError("Unknown DHT22 backend: %r" % (dht_backend,))
+
+        # DHT22: "adafruit" bit-bangs in Python, "edge" decodes kernel
+        # timestamped GPIO events
         try:
-            self.dhtDevice = adafruit_dht.DHT22(dht_pin, use_pulseio=False)
-            logging.info("DHT22 sensor initialized on %s", dht_pin)
+            if dht_backend == "edge":
+                from .dht22 import DHT22EdgeReader
+                self.dhtDevice = DHT22EdgeReader(getattr(dht_pin, "id", dht_pin),
+                                                 chip=gpio_chip,
+                                                 tolerance_us=dht_tolerance_us)
+            else:
+                self.dhtDevice = adafruit_dht.DHT22(dht_pin, use_pulseio=False)
+            logging.info("DHT22 sensor initialized on %s (%s backend)", dht_pin, dht_backend)
         except Exception as e:
             logging.error("Failed to initialize DHT22 sensor: %s", e)
             self.dhtDevice = None
@@ -0,0 +1,103 @@
+import enum
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class Direction(enum.Enum):
+    INPUT = 1
+    OUTPUT = 2
+
+
+Bias = enum.Enum("Bias", "PULL_UP")
+Edge = enum.Enum("Edge", "BOTH")
+Value = enum.Enum("Value", "INACTIVE ACTIVE")
+
+
+class LineSettings:
+    def __init__(self, direction=None, edge_detection=None, bias=None,
+                 output_value=None):
+        self.direction = direction
+        self.edge_detection = edge_detection
+        self.bias = bias
+        self.output_value = output_value
+
+
+class EdgeEvent:
+    Type = enum.Enum("Type", "RISING_EDGE FALLING_EDGE")
+
+    def __init__(self, timestamp_ns, level, line_seqno):
+        self.timestamp_ns = timestamp_ns
+        self.event_type = (self.Type.RISING_EDGE if level
+                           else self.Type.FALLING_EDGE)
+        self.line_seqno = line_seqno
+
+
+def make_events(timestamps_ns, levels, first_seqno=1):
+    return [EdgeEvent(int(t), int(lv), first_seqno + i)
+            for i, (t, lv) in enumerate(zip(timestamps_ns, levels))]
+
+
+class FakeRequest:
+    """Line request that replays ``frame`` each time the start signal ends.
+
+    ``stale`` events are pending before the first capture, as if an earlier
+    one had timed out mid-frame. Events are handed out ``batch`` at a time.
+    """
+
+    def __init__(self, offset, frame=(), stale=(), batch=16):
+        self.offset = offset
+        self.frame = list(frame)
+        self.pending = list(stale)
+        self.batch = batch
+        self.driven_low = False
+        self.captures = 0
+        self.released = False
+
+    def reconfigure_lines(self, config):
+        settings = config[self.offset]
+        if settings.direction == Direction.OUTPUT:
+            self.driven_low = True
+        elif self.driven_low:
+            self.driven_low = False
+            self.captures += 1
+            self.pending.extend(self.frame)
+
+    def wait_edge_events(self, timeout):
+        return bool(self.pending)
+
+    def read_edge_events(self):
+        events = self.pending[:self.batch]
+        del self.pending[:self.batch]
+        return events
+
+    def release(self):
+        self.released = True
+
+
+@pytest.fixture
+def fake_gpiod(monkeypatch):
+    """Install a minimal libgpiod v2 stand-in; returns the requests made."""
+    requests = []
+    gpiod = types.ModuleType("gpiod")
+    line = types.ModuleType("gpiod.line")
+    line.Bias, line.Direction, line.Edge, line.Value = Bias, Direction, Edge, Value
+    gpiod.line = line
+    gpiod.LineSettings = LineSettings
+
+    def request_lines(chip, consumer=None, config=None, event_buffer_size=None):
+        (offset,) = config
+        request = FakeRequest(offset)
+        request.chip = chip
+        request.event_buffer_size = event_buffer_size
+        requests.append(request)
+        return request
+
+    gpiod.request_lines = request_lines
+    monkeypatch.setitem(sys.modules, "gpiod", gpiod)
+    monkeypatch.setitem(sys.modules, "gpiod.line", line)
+    return requests
@@ -0,0 +1,152 @@
+import os
+
+import numpy as np
+import pytest
+from conftest import make_events
+
+from Thermostat import dht22
+from Thermostat.dht22 import (DHT22EdgeReader, decode_edges, load_trace,
+                              save_trace, synthesize_edges)
+
+# Hand-built trace with the sensor preamble, absolute CLOCK_MONOTONIC
+# timestamps and datasheet-range pulse widths: 48.3 %RH, 21.7 C
+TRACE_PATH = os.path.join(os.path.dirname(__file__), "data", "dht22_trace.npz")
+
+
+@pytest.mark.parametrize("temperature, humidity", [
+    (23.4, 45.6),
+    (-12.3, 56.7),
+    (0.0, 0.0),
+    (80.0, 99.9),
+])
+def test_round_trip(temperature, humidity):
+    ts, lv = synthesize_edges(temperature, humidity)
+    assert decode_edges(ts, lv) == (temperature, humidity)
+
+
+def test_round_trip_with_small_jitter():
+    rng = np.random.default_rng(1)
+    ts, lv = synthesize_edges(21.5, 40.2, jitter_us=2, rng=rng)
+    assert decode_edges(ts, lv) == (21.5, 40.2)
+
+
+def test_recorded_trace():
+    assert decode_edges(*load_trace(TRACE_PATH)) == (21.7, 48.3)
+
+
+def test_recorded_trace_with_leading_glitch():
+    ts, lv = load_trace(TRACE_PATH)
+    ts = np.concatenate(([ts[0] - 40000, ts[0] - 38000], ts))
+    lv = np.concatenate(([1, 0], lv)).astype(np.int8)
+    assert decode_edges(ts, lv) == (21.7, 48.3)
+
+
+def test_flipped_bit_fails_checksum():
+    ts, lv = synthesize_edges(23.4, 45.6)
+    # Lengthen the high pulse of the lowest humidity bit from '0' to '1'
+    highs = np.flatnonzero((lv[:-1] == 1) & (lv[1:] == 0))[-40:]
+    fall = highs[15] + 1
+    assert ts[fall] - ts[highs[15]] < 48000
+    ts = ts.copy()
+    ts[fall:] += 43000
+    with pytest.raises(RuntimeError, match="checksum"):
+        decode_edges(ts, lv)
+
+
+def test_out_of_tolerance_width():
+    ts, lv = synthesize_edges(23.4, 45.6)
+    highs = np.flatnonzero((lv[:-1] == 1) & (lv[1:] == 0))[-40:]
+    ts = ts.copy()
+    ts[highs[0] + 1:] += 100000
+    with pytest.raises(RuntimeError, match="tolerance"):
+        decode_edges(ts, lv)
+
+
+def test_short_frame():
+    ts, lv = synthesize_edges(23.4, 45.6)
+    with pytest.raises(RuntimeError, match="too short"):
+        decode_edges(ts[:40], lv[:40])
+
+
+def test_cut_off_tail_is_not_shifted():
+    # Losing the last bit must not slide the response pulse into the frame
+    ts, lv = synthesize_edges(23.4, 45.6)
+    with pytest.raises(RuntimeError, match="too short"):
+        decode_edges(ts[:-4], lv[:-4])
+
+
+def test_missing_response():
+    ts, lv = synthesize_edges(23.4, 45.6)
+    with pytest.raises(RuntimeError, match="response"):
+        decode_edges(ts[4:], lv[4:])
+
+
+def test_mismatched_shapes():
+    ts, lv = synthesize_edges(23.4, 45.6)
+    with pytest.raises(ValueError):
+        decode_edges(ts, lv[:-1])
+
+
+def test_saved_trace_replays(tmp_path):
+    path = tmp_path / "trace.npz"
+    save_trace(path, *load_trace(TRACE_PATH))
+    assert decode_edges(*load_trace(path)) == (21.7, 48.3)
+
+
+def make_reader(fake_gpiod, frame=(), stale=()):
+    reader = DHT22EdgeReader(4, chip="/dev/gpiochip4")
+    request = fake_gpiod[0]
+    request.frame = list(frame)
+    request.pending = list(stale)
+    return reader, request
+
+
+def test_reader_requests_buffer_for_whole_frame(fake_gpiod):
+    reader, request = make_reader(fake_gpiod)
+    assert request.chip == "/dev/gpiochip4"
+    assert request.offset == 4
+    assert request.event_buffer_size >= 2 * dht22.FRAME_BITS + 5
+
+
+def test_reader_decodes_capture(fake_gpiod):
+    ts, lv = load_trace(TRACE_PATH)
+    reader, request = make_reader(fake_gpiod, make_events(ts, lv))
+    assert (reader.temperature, reader.humidity) == (21.7, 48.3)
+    np.testing.assert_array_equal(reader.last_trace[0], ts)
+    np.testing.assert_array_equal(reader.last_trace[1], lv)
+
+
+def test_reader_drains_stale_events(fake_gpiod):
+    ts, lv = load_trace(TRACE_PATH)
+    stale = make_events(ts[30:] - 10**9, lv[30:])
+    reader, request = make_reader(fake_gpiod, make_events(ts, lv, 100), stale)
+    assert reader.temperature == 21.7
+    assert len(reader.last_trace[0]) == len(ts)
+
+
+def test_reader_rejects_dropped_events(fake_gpiod):
+    ts, lv = load_trace(TRACE_PATH)
+    events = make_events(ts, lv)
+    del events[50]
+    reader, request = make_reader(fake_gpiod, events)
+    with pytest.raises(RuntimeError, match="dropped"):
+        reader.measure()
+    # The raw capture is still kept for inspection
+    assert len(reader.last_trace[0]) == len(ts) - 1
+
+
+def test_reader_caches_within_min_interval(fake_gpiod):
+    ts, lv = load_trace(TRACE_PATH)
+    reader, request = make_reader(fake_gpiod, make_events(ts, lv))
+    reader.temperature
+    reader.humidity
+    assert request.captures == 1
+    reader._last_read -= dht22.MIN_INTERVAL_S
+    reader.temperature
+    assert request.captures == 2
+
+
+def test_reader_exit_releases_line(fake_gpiod):
+    reader, request = make_reader(fake_gpiod)
+    reader.exit()
+    assert request.released
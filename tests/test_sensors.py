@@ -0,0 +1,47 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+
+class Pin:
+    def __init__(self, id):
+        self.id = id
+
+    def __repr__(self):
+        return "D%d" % self.id
+
+
+@pytest.fixture
+def sensors(monkeypatch, fake_gpiod):
+    """Import Thermostat.sensors against stand-in board/DHT/SMBus modules."""
+    board = types.ModuleType("board")
+    board.D4 = Pin(4)
+    adafruit_dht = types.ModuleType("adafruit_dht")
+    adafruit_dht.DHT22 = lambda pin, use_pulseio=True: ("adafruit", pin)
+    smbus2 = types.ModuleType("smbus2")
+    smbus2.SMBus = lambda bus_num: object()
+    for name, module in [("board", board), ("adafruit_dht", adafruit_dht),
+                         ("smbus2", smbus2)]:
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.delitem(sys.modules, "Thermostat.sensors", raising=False)
+    return importlib.import_module("Thermostat.sensors")
+
+
+def test_default_backend_is_adafruit(sensors):
+    mgr = sensors.SensorManager()
+    assert mgr.dhtDevice[0] == "adafruit"
+
+
+def test_edge_backend_uses_pin_id_as_line_offset(sensors, fake_gpiod):
+    mgr = sensors.SensorManager(dht_pin=Pin(17), dht_backend="edge",
+                                gpio_chip="/dev/gpiochip4")
+    assert mgr.dhtDevice.line_offset == 17
+    assert fake_gpiod[0].offset == 17
+    assert fake_gpiod[0].chip == "/dev/gpiochip4"
+
+
+def test_unknown_backend_raises(sensors):
+    with pytest.raises(ValueError, match="egde"):
+        sensors.SensorManager(dht_backend="egde")